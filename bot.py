@@ -2,15 +2,22 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import asyncio
-import json
+import atexit
+import hashlib
 import os
-from datetime import datetime
+import random
+import signal
+import orjson
+from collections import defaultdict
+from datetime import datetime, timezone
 from keep_alive import keep_alive
 
 # ─────────────────────────────────────────
 #  Config — reads from environment variables
 #  Set DISCORD_TOKEN and LOG_CHANNEL_ID in
 #  the Replit Secrets panel (🔒 icon).
+#  Set LOG_MESSAGE_CONTENT=0 to drop the
+#  privileged Message Content intent.
 # ─────────────────────────────────────────
 TOKEN = os.environ.get("DISCORD_TOKEN")
 if not TOKEN:
@@ -22,42 +29,194 @@ if not TOKEN:
 _log_id = os.environ.get("LOG_CHANNEL_ID", "")
 LOG_CHANNEL_ID = int(_log_id) if _log_id.strip().isdigit() else None
 
+LOG_MESSAGE_CONTENT = os.environ.get("LOG_MESSAGE_CONTENT", "1").strip().lower() not in ("0", "false", "no", "off")
+
 CONFIG_FILE   = "config.json"
-WARN_FILE     = "warnings.json"
+WARN_FILE     = "warnings.jsonl"
+LEGACY_WARN_FILE = "warnings.json"
+WARN_COMPACT_THRESHOLD = 50   # tombstones tolerated before warnings.jsonl is rewritten
+WARN_FLUSH_INTERVAL    = 5    # seconds between warnings.jsonl flushes
+DM_GRACE_SECONDS       = 2    # head start a ban/kick DM gets before the member is removed
+SYNC_HASH_FILE         = ".last_sync_hash"
+LOG_SEND_ATTEMPTS      = 4    # tries per log message before it is dropped
+LOG_SEND_INTERVAL      = 1.0  # seconds between log messages (channel limit is 5 per 5s)
 
 
 # ─────────────────────────────────────────
 #  Config helpers  (mod/admin role IDs)
 # ─────────────────────────────────────────
+_config_cache = {"mtime": None, "data": {}}
+_config_lock  = asyncio.Lock()
+
+
+def _cached_load(path: str, cache: dict) -> dict:
+    # Re-parse only when the file's mtime has moved since the last read.
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    if cache["mtime"] != mtime:
+        with open(path, "rb") as f:
+            cache["data"] = orjson.loads(f.read())
+        cache["mtime"] = mtime
+    return cache["data"]
+
+def _cached_save(path: str, cache: dict, data: dict):
+    # Written aside and swapped in, so a reader on the event loop never sees
+    # a truncated file; the cache is only updated once that has gone through.
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    os.replace(tmp, path)
+    cache["data"]  = data
+    cache["mtime"] = os.stat(path).st_mtime_ns
+
+
 def load_config() -> dict:
-    if os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE) as f:
-            return json.load(f)
-    return {}
+    return _cached_load(CONFIG_FILE, _config_cache)
+
+def save_config_sync(data: dict):
+    _cached_save(CONFIG_FILE, _config_cache, data)
+
+async def update_guild_config(guild_id: int, **changes):
+    # The lock spans load -> copy -> write so two updates can't start from the
+    # same snapshot and overwrite each other. The live cache is copied, not
+    # mutated, and the write runs in a worker thread off the gateway loop.
+    async with _config_lock:
+        data = dict(load_config())
+        gid  = str(guild_id)
+        data[gid] = {**data.get(gid, {}), **changes}
+        await asyncio.to_thread(save_config_sync, data)
 
-def save_config(data: dict):
-    with open(CONFIG_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+def get_guild_config(guild_id: int) -> dict:
+    return load_config().get(str(guild_id), {})
 
 def get_mod_role_id(guild_id: int) -> int | None:
-    return load_config().get(str(guild_id), {}).get("mod_role_id")
+    return get_guild_config(guild_id).get("mod_role_id")
 
 def get_admin_role_id(guild_id: int) -> int | None:
-    return load_config().get(str(guild_id), {}).get("admin_role_id")
+    return get_guild_config(guild_id).get("admin_role_id")
 
 
 # ─────────────────────────────────────────
 #  Warning helpers
 # ─────────────────────────────────────────
-def load_warnings() -> dict:
-    if os.path.exists(WARN_FILE):
-        with open(WARN_FILE) as f:
-            return json.load(f)
-    return {}
+# warnings.jsonl is an append-only log: one line per warning
+#   {"g": guild_id, "u": user_id, "reason": ..., "moderator": ..., "timestamp": ...}
+# and one tombstone line {"g": ..., "u": ..., "clear": true} per /clearwarnings.
+# It is replayed into _warn_index once at startup; reads never touch the disk.
+# New records are buffered in _warn_pending and flushed in one write every
+# WARN_FLUSH_INTERVAL seconds by _warn_flusher (and once more at exit).
+# Keyed by raw guild / user id. Reads go through .get() so lookups never
+# insert empty entries.
+_warn_index: defaultdict[int, defaultdict[int, list]] = defaultdict(lambda: defaultdict(list))
+_warn_pending: list[bytes] = []
+_warn_tombstones = 0
+_warn_flusher_task: asyncio.Task | None = None
+_warn_flush_lock = asyncio.Lock()   # the flusher and shutdown may both flush
+
+
+def _load_warn_index():
+    global _warn_tombstones
+    if not os.path.exists(WARN_FILE):
+        if os.path.exists(LEGACY_WARN_FILE):
+            with open(LEGACY_WARN_FILE, "rb") as f:
+                for gid, users in orjson.loads(f.read()).items():
+                    _warn_index[int(gid)].update((int(uid), warns) for uid, warns in users.items())
+            _write_warn_file_sync(_warn_snapshot())
+        return
+    with open(WARN_FILE, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            rec = orjson.loads(line)
+            gid, uid = int(rec.pop("g")), int(rec.pop("u"))
+            if rec.get("clear"):
+                _warn_index.get(gid, {}).pop(uid, None)
+                _warn_tombstones += 1
+            else:
+                _warn_index[gid][uid].append(rec)
+
+def _append_warn_file_sync(payload: bytes):
+    with open(WARN_FILE, "ab") as f:
+        f.write(payload)
+
+def _warn_snapshot() -> bytes:
+    # Serialised on the event loop so the index can't change mid-iteration.
+    return b"".join(
+        orjson.dumps({"g": gid, "u": uid, **w}) + b"\n"
+        for gid, users in _warn_index.items()
+        for uid, warns in users.items()
+        for w in warns
+    )
 
-def save_warnings(data: dict):
-    with open(WARN_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+def _write_warn_file_sync(payload: bytes):
+    tmp = WARN_FILE + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(payload)
+    os.replace(tmp, WARN_FILE)
+
+def _take_warn_flush():
+    # Compaction rewrites the whole file from the index, which already
+    # contains anything still pending, so it replaces the append.
+    # Nothing is cleared here: _commit_warn_flush() drops exactly what was
+    # written once the write succeeds, so a failed write is retried.
+    pending = len(_warn_pending)
+    if _warn_tombstones > WARN_COMPACT_THRESHOLD:
+        return _write_warn_file_sync, _warn_snapshot(), pending, _warn_tombstones
+    if pending:
+        return _append_warn_file_sync, b"".join(_warn_pending), pending, 0
+    return None
+
+def _commit_warn_flush(pending: int, tombstones: int):
+    # Records queued while the write was in flight stay for the next flush.
+    global _warn_tombstones
+    del _warn_pending[:pending]
+    _warn_tombstones -= tombstones
+
+async def flush_warnings():
+    async with _warn_flush_lock:
+        job = _take_warn_flush()
+        if job:
+            write, payload, pending, tombstones = job
+            await asyncio.to_thread(write, payload)
+            _commit_warn_flush(pending, tombstones)
+
+def flush_warnings_sync():
+    job = _take_warn_flush()
+    if job:
+        write, payload, pending, tombstones = job
+        write(payload)
+        _commit_warn_flush(pending, tombstones)
+
+async def _warn_flusher():
+    while True:
+        await asyncio.sleep(WARN_FLUSH_INTERVAL)
+        try:
+            await flush_warnings()
+        except Exception as e:
+            print(f"⚠️  Couldn't write {WARN_FILE}, will retry: {e!r}")
+
+
+def get_warnings(guild_id: int, user_id: int) -> list:
+    return _warn_index.get(guild_id, {}).get(user_id, [])
+
+def add_warning(guild_id: int, user_id: int, entry: dict) -> int:
+    warns = _warn_index[guild_id][user_id]
+    warns.append(entry)
+    _warn_pending.append(orjson.dumps({"g": guild_id, "u": user_id, **entry}) + b"\n")
+    return len(warns)
+
+def clear_warnings(guild_id: int, user_id: int):
+    global _warn_tombstones
+    if _warn_index.get(guild_id, {}).pop(user_id, None) is None:
+        return
+    _warn_pending.append(orjson.dumps({"g": guild_id, "u": user_id, "clear": True}) + b"\n")
+    _warn_tombstones += 1
+
+
+_load_warn_index()
+atexit.register(flush_warnings_sync)
 
 
 # ─────────────────────────────────────────
@@ -65,27 +224,138 @@ def save_warnings(data: dict):
 # ─────────────────────────────────────────
 intents = discord.Intents.default()
 intents.members = True
-intents.message_content = True
+intents.message_content = LOG_MESSAGE_CONTENT   # only needed to show text in edit/delete logs
+
+class ModBot(commands.Bot):
+    async def setup_hook(self):
+        # Hosts like Replit stop the bot with SIGTERM, which skips atexit;
+        # route it through close() so pending warnings get written.
+        try:
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGTERM, lambda: _spawn(self.close())
+            )
+        except NotImplementedError:   # Windows event loops
+            pass
+
+    async def close(self):
+        try:
+            await flush_warnings()
+        except Exception as e:
+            print(f"⚠️  Couldn't write {WARN_FILE} on shutdown: {e!r}")
+        await super().close()
 
-bot = commands.Bot(command_prefix="!", intents=intents)
+
+bot = ModBot(command_prefix="!", intents=intents)
 
 
 # ─────────────────────────────────────────
 #  Shared helpers
 # ─────────────────────────────────────────
-def mod_embed(title: str, colour: discord.Colour, **fields) -> discord.Embed:
-    embed = discord.Embed(title=title, colour=colour, timestamp=datetime.utcnow())
+_FIELD_NAME_CACHE: dict[str, str] = {}   # "total_warnings" -> "Total Warnings"
+
+
+def mod_embed(title: str, colour: discord.Colour, ts: datetime | None = None, **fields) -> discord.Embed:
+    embed = discord.Embed(title=title, colour=colour, timestamp=ts or datetime.now(timezone.utc))
     for name, value in fields.items():
-        embed.add_field(name=name.replace("_", " ").title(), value=value, inline=True)
+        pretty = _FIELD_NAME_CACHE.get(name)
+        if pretty is None:
+            pretty = _FIELD_NAME_CACHE[name] = name.replace("_", " ").title()
+        embed.add_field(name=pretty, value=value, inline=True)
     embed.set_footer(text="Moderation Bot")
     return embed
 
 
-async def log(guild: discord.Guild, embed: discord.Embed):
+def _reltime(dt: datetime | None) -> str:
+    # Discord relative-timestamp markup, as discord.utils.format_dt(dt, "R") builds it.
+    return f"<t:{int(dt.timestamp())}:R>" if dt else "Unknown"
+
+
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _task_done(task: asyncio.Task):
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        print(f"⚠️  Background task {task.get_name()} failed: {task.exception()!r}")
+
+def _spawn(coro) -> asyncio.Task:
+    # Keep a strong reference so the task isn't garbage-collected mid-flight.
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_task_done)
+    return task
+
+
+async def _try_dm(member: discord.Member, embed: discord.Embed):
+    try:
+        await member.send(embed=embed)
+    except discord.HTTPException:   # includes Forbidden (DMs closed)
+        pass
+
+
+_log_channel_cache: dict[int, discord.abc.Messageable] = {}
+_log_queue: asyncio.Queue[tuple[discord.abc.Messageable, discord.Embed]] = asyncio.Queue()
+_log_consumer_task: asyncio.Task | None = None
+
+# Discord caps a single message at 10 embeds and 6000 embed characters.
+_MAX_EMBEDS_PER_MESSAGE = 10
+_MAX_EMBED_CHARS        = 6000
+
+
+async def _safe_send(ch: discord.abc.Messageable, embeds: list[discord.Embed], attempts: int = LOG_SEND_ATTEMPTS):
+    # Exponential backoff with jitter, so a burst of mod actions that trips
+    # the rate limit doesn't retry in lockstep.
+    for i in range(attempts):
+        try:
+            return await ch.send(embeds=embeds)
+        except discord.HTTPException as e:
+            if i == attempts - 1 or not (e.status == 429 or e.status >= 500):
+                raise
+            await asyncio.sleep(2 ** i + random.random())
+
+
+def _log_batches(items: list[tuple[discord.abc.Messageable, discord.Embed]]):
+    # Group queued embeds by channel, oldest first, into sendable messages.
+    by_channel: dict[discord.abc.Messageable, list[discord.Embed]] = {}
+    for ch, embed in items:
+        by_channel.setdefault(ch, []).append(embed)
+    for ch, embeds in by_channel.items():
+        batch, chars = [], 0
+        for embed in embeds:
+            size = len(embed)
+            if batch and (len(batch) == _MAX_EMBEDS_PER_MESSAGE or chars + size > _MAX_EMBED_CHARS):
+                yield ch, batch
+                batch, chars = [], 0
+            batch.append(embed)
+            chars += size
+        yield ch, batch
+
+
+async def _log_consumer():
+    # The only task that writes to log channels, so sends are paced and
+    # anything queued while it sleeps goes out together.
+    while True:
+        items = [await _log_queue.get()]
+        while not _log_queue.empty():
+            items.append(_log_queue.get_nowait())
+        for ch, batch in _log_batches(items):
+            try:
+                await _safe_send(ch, batch)
+            except Exception as e:   # connection errors surface as OSError/aiohttp errors
+                print(f"⚠️  Dropped {len(batch)} log embed(s): {e!r}")
+            await asyncio.sleep(LOG_SEND_INTERVAL)
+
+
+def log(guild: discord.Guild, embed: discord.Embed):
+    """Queue embed for the log channel; returns immediately."""
     if LOG_CHANNEL_ID:
-        ch = guild.get_channel(LOG_CHANNEL_ID)
-        if ch:
-            await ch.send(embed=embed)
+        ch = _log_channel_cache.get(guild.id)
+        if ch is None:
+            ch = guild.get_channel(LOG_CHANNEL_ID)
+            if ch is None:
+                return
+            _log_channel_cache[guild.id] = ch
+        _log_queue.put_nowait((ch, embed))
 
 
 # ─────────────────────────────────────────
@@ -102,11 +372,10 @@ def is_mod():
         user = interaction.user
         if user.guild_permissions.administrator:
             return True
-        gid = interaction.guild.id
-        admin_id = get_admin_role_id(gid)
-        mod_id   = get_mod_role_id(gid)
-        role_ids = {r.id for r in user.roles}
-        if (admin_id and admin_id in role_ids) or (mod_id and mod_id in role_ids):
+        guild_cfg = get_guild_config(interaction.guild.id)
+        admin_id  = guild_cfg.get("admin_role_id")
+        mod_id    = guild_cfg.get("mod_role_id")
+        if (admin_id and user.get_role(admin_id) is not None) or (mod_id and user.get_role(mod_id) is not None):
             return True
         await interaction.response.send_message(
             "❌ You need a **Moderator** or **Admin** role to use this command.", ephemeral=True
@@ -126,7 +395,7 @@ def is_admin():
         if user.guild_permissions.administrator:
             return True
         admin_id = get_admin_role_id(interaction.guild.id)
-        if admin_id and admin_id in {r.id for r in user.roles}:
+        if admin_id and user.get_role(admin_id) is not None:
             return True
         await interaction.response.send_message(
             "❌ You need an **Admin** role to use this command.", ephemeral=True
@@ -138,63 +407,115 @@ def is_admin():
 # ─────────────────────────────────────────
 #  Events
 # ─────────────────────────────────────────
+def _command_hash() -> str:
+    # Keyed on the application too, so switching tokens still forces a sync.
+    payload = [bot.application_id, [c.to_dict(bot.tree) for c in bot.tree.get_commands()]]
+    return hashlib.sha1(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+async def sync_commands() -> bool:
+    # on_ready fires again on every reconnect; only hit the global sync
+    # endpoint when the local command definitions have actually changed.
+    cmd_hash = _command_hash()
+    try:
+        with open(SYNC_HASH_FILE) as f:
+            if f.read().strip() == cmd_hash:
+                return False
+    except FileNotFoundError:
+        pass
+    await bot.tree.sync()
+    with open(SYNC_HASH_FILE, "w") as f:
+        f.write(cmd_hash)
+    return True
+
+
 @bot.event
 async def on_ready():
-    await bot.tree.sync()
+    global _warn_flusher_task, _log_consumer_task
+    if _warn_flusher_task is None or _warn_flusher_task.done():
+        _warn_flusher_task = _spawn(_warn_flusher())
+    if _log_consumer_task is None or _log_consumer_task.done():
+        _log_consumer_task = _spawn(_log_consumer())
     print(f"✅  Logged in as {bot.user} (ID: {bot.user.id})")
-    print(f"✅  Slash commands synced.")
+    if await sync_commands():
+        print(f"✅  Slash commands synced.")
+    else:
+        print(f"✅  Slash commands unchanged, sync skipped.")
     await bot.change_presence(activity=discord.Activity(
         type=discord.ActivityType.watching,
         name="judge, jury & executioner"
     ))
 
 
+@bot.event
+async def on_guild_channel_delete(channel: discord.abc.GuildChannel):
+    if channel.id == LOG_CHANNEL_ID:
+        _log_channel_cache.pop(channel.guild.id, None)
+
+
 @bot.event
 async def on_member_join(member: discord.Member):
+    if LOG_CHANNEL_ID is None:
+        return
     embed = mod_embed(
         "👋 Member Joined", discord.Colour.green(),
         user=member.mention,
-        account_created=discord.utils.format_dt(member.created_at, "R"),
+        account_created=_reltime(member.created_at),
         member_count=str(member.guild.member_count)
     )
-    await log(member.guild, embed)
+    log(member.guild, embed)
 
 
 @bot.event
 async def on_member_remove(member: discord.Member):
+    if LOG_CHANNEL_ID is None:
+        return
     embed = mod_embed(
         "🚪 Member Left", discord.Colour.orange(),
         user=f"{member} ({member.id})",
-        joined_at=discord.utils.format_dt(member.joined_at, "R") if member.joined_at else "Unknown"
+        joined_at=_reltime(member.joined_at)
     )
-    await log(member.guild, embed)
+    log(member.guild, embed)
 
 
 @bot.event
 async def on_message_delete(message: discord.Message):
-    if message.author.bot:
+    if LOG_CHANNEL_ID is None or message.author.bot:
         return
+    content = {"content": message.content[:1024] or "*empty*"} if LOG_MESSAGE_CONTENT else {}
     embed = mod_embed(
         "🗑️ Message Deleted", discord.Colour.red(),
         author=f"{message.author} ({message.author.id})",
         channel=message.channel.mention,
-        content=message.content[:1024] or "*empty*"
+        **content
     )
-    await log(message.guild, embed)
+    log(message.guild, embed)
 
 
 @bot.event
 async def on_message_edit(before: discord.Message, after: discord.Message):
-    if before.author.bot or before.content == after.content:
+    if LOG_CHANNEL_ID is None or before.author.bot:
         return
+    # Embed unfurls, pins and the like also fire this event but don't bump
+    # edited_at, so they're dropped without looking at the content.
+    if before.edited_at == after.edited_at:
+        return
+    if LOG_MESSAGE_CONTENT:
+        if before.content == after.content:
+            return
+        content = {
+            "before": before.content[:512] or "*empty*",
+            "after":  after.content[:512] or "*empty*"
+        }
+    else:
+        content = {}
     embed = mod_embed(
         "✏️ Message Edited", discord.Colour.yellow(),
         author=f"{before.author} ({before.author.id})",
         channel=before.channel.mention,
-        before=before.content[:512] or "*empty*",
-        after=after.content[:512] or "*empty*"
+        **content
     )
-    await log(before.guild, embed)
+    log(before.guild, embed)
 
 
 # ═══════════════════════════════════════════════════════════
@@ -207,9 +528,7 @@ async def on_message_edit(before: discord.Message, after: discord.Message):
 @app_commands.describe(role="The role to designate as Moderator")
 @is_admin()
 async def setmodrole(interaction: discord.Interaction, role: discord.Role):
-    data = load_config()
-    data.setdefault(str(interaction.guild.id), {})["mod_role_id"] = role.id
-    save_config(data)
+    await update_guild_config(interaction.guild.id, mod_role_id=role.id)
     await interaction.response.send_message(
         f"✅ **Moderator** role set to {role.mention}.", ephemeral=True
     )
@@ -219,9 +538,7 @@ async def setmodrole(interaction: discord.Interaction, role: discord.Role):
 @app_commands.describe(role="The role to designate as Admin")
 @is_admin()
 async def setadminrole(interaction: discord.Interaction, role: discord.Role):
-    data = load_config()
-    data.setdefault(str(interaction.guild.id), {})["admin_role_id"] = role.id
-    save_config(data)
+    await update_guild_config(interaction.guild.id, admin_role_id=role.id)
     await interaction.response.send_message(
         f"✅ **Admin** role set to {role.mention}.", ephemeral=True
     )
@@ -244,22 +561,29 @@ async def ban(
         return await interaction.response.send_message(
             "❌ You cannot ban someone with an equal or higher role.", ephemeral=True
         )
+    await interaction.response.defer()
+    now = datetime.now(timezone.utc)
+    # Once banned the member may share no server with the bot, so give the DM a
+    # short head start — but never let a slow DM hold up the ban itself.
+    dm_task = _spawn(_try_dm(member, mod_embed(
+        f"🔨 You have been banned from {interaction.guild.name}",
+        discord.Colour.red(), now, reason=reason, moderator=str(interaction.user)
+    )))
+    await asyncio.wait({dm_task}, timeout=DM_GRACE_SECONDS)
     try:
-        await member.send(embed=mod_embed(
-            f"🔨 You have been banned from {interaction.guild.name}",
-            discord.Colour.red(), reason=reason, moderator=str(interaction.user)
-        ))
-    except discord.Forbidden:
-        pass
-    await member.ban(reason=f"{interaction.user}: {reason}", delete_message_days=delete_days)
+        await member.ban(reason=f"{interaction.user}: {reason}", delete_message_days=delete_days)
+    except discord.HTTPException as e:   # e.g. Forbidden when the bot's role is below theirs
+        return await interaction.followup.send(
+            f"❌ Couldn't ban {member.mention}: {e.text or e.status}", ephemeral=True
+        )
     embed = mod_embed(
-        "🔨 Member Banned", discord.Colour.red(),
+        "🔨 Member Banned", discord.Colour.red(), now,
         member=f"{member} ({member.id})",
         reason=reason,
         moderator=interaction.user.mention
     )
-    await interaction.response.send_message(embed=embed)
-    await log(interaction.guild, embed)
+    await interaction.followup.send(embed=embed)
+    log(interaction.guild, embed)
 
 
 @bot.tree.command(name="unban", description="[Admin] Unban a user by their ID.")
@@ -276,7 +600,7 @@ async def unban(interaction: discord.Interaction, user_id: str, reason: str = "N
             moderator=interaction.user.mention
         )
         await interaction.response.send_message(embed=embed)
-        await log(interaction.guild, embed)
+        log(interaction.guild, embed)
     except discord.NotFound:
         await interaction.response.send_message("❌ User not found or not banned.", ephemeral=True)
     except ValueError:
@@ -287,18 +611,14 @@ async def unban(interaction: discord.Interaction, user_id: str, reason: str = "N
 @app_commands.describe(member="The member whose warnings to clear")
 @is_admin()
 async def clearwarnings(interaction: discord.Interaction, member: discord.Member):
-    data = load_warnings()
-    guild_id = str(interaction.guild.id)
-    user_id  = str(member.id)
-    data.get(guild_id, {}).pop(user_id, None)
-    save_warnings(data)
+    clear_warnings(interaction.guild.id, member.id)
     embed = mod_embed(
         "🧹 Warnings Cleared", discord.Colour.green(),
         member=f"{member} ({member.id})",
         moderator=interaction.user.mention
     )
     await interaction.response.send_message(embed=embed)
-    await log(interaction.guild, embed)
+    log(interaction.guild, embed)
 
 
 @bot.tree.command(name="announce", description="[Admin] Send a formatted announcement to a channel.")
@@ -320,7 +640,7 @@ async def announce(
         title=f"📢 {title}",
         description=message,
         colour=discord.Colour.from_rgb(232, 49, 42),
-        timestamp=datetime.utcnow()
+        timestamp=datetime.now(timezone.utc)
     )
     embed.set_footer(text=f"Announced by {interaction.user}")
     content = ping.mention if ping else None
@@ -363,7 +683,7 @@ async def role_cmd(
         moderator=interaction.user.mention
     )
     await interaction.response.send_message(embed=embed)
-    await log(interaction.guild, embed)
+    log(interaction.guild, embed)
 
 
 # ═══════════════════════════════════════════════════════════
@@ -384,22 +704,27 @@ async def kick(
         return await interaction.response.send_message(
             "❌ You cannot kick someone with an equal or higher role.", ephemeral=True
         )
+    await interaction.response.defer()
+    now = datetime.now(timezone.utc)
+    dm_task = _spawn(_try_dm(member, mod_embed(
+        f"👢 You have been kicked from {interaction.guild.name}",
+        discord.Colour.orange(), now, reason=reason, moderator=str(interaction.user)
+    )))
+    await asyncio.wait({dm_task}, timeout=DM_GRACE_SECONDS)
     try:
-        await member.send(embed=mod_embed(
-            f"👢 You have been kicked from {interaction.guild.name}",
-            discord.Colour.orange(), reason=reason, moderator=str(interaction.user)
-        ))
-    except discord.Forbidden:
-        pass
-    await member.kick(reason=f"{interaction.user}: {reason}")
+        await member.kick(reason=f"{interaction.user}: {reason}")
+    except discord.HTTPException as e:   # e.g. Forbidden when the bot's role is below theirs
+        return await interaction.followup.send(
+            f"❌ Couldn't kick {member.mention}: {e.text or e.status}", ephemeral=True
+        )
     embed = mod_embed(
-        "👢 Member Kicked", discord.Colour.orange(),
+        "👢 Member Kicked", discord.Colour.orange(), now,
         member=f"{member} ({member.id})",
         reason=reason,
         moderator=interaction.user.mention
     )
-    await interaction.response.send_message(embed=embed)
-    await log(interaction.guild, embed)
+    await interaction.followup.send(embed=embed)
+    log(interaction.guild, embed)
 
 
 @bot.tree.command(name="timeout", description="[Mod] Timeout (mute) a member.")
@@ -429,7 +754,7 @@ async def timeout_cmd(
         moderator=interaction.user.mention
     )
     await interaction.response.send_message(embed=embed)
-    await log(interaction.guild, embed)
+    log(interaction.guild, embed)
 
 
 @bot.tree.command(name="untimeout", description="[Mod] Remove a timeout from a member.")
@@ -448,7 +773,7 @@ async def untimeout_cmd(
         moderator=interaction.user.mention
     )
     await interaction.response.send_message(embed=embed)
-    await log(interaction.guild, embed)
+    log(interaction.guild, embed)
 
 
 @bot.tree.command(name="warn", description="[Mod] Warn a member and log it.")
@@ -459,47 +784,40 @@ async def warn(
     member: discord.Member,
     reason: str = "No reason provided"
 ):
-    data = load_warnings()
-    guild_id = str(interaction.guild.id)
-    user_id  = str(member.id)
-    data.setdefault(guild_id, {}).setdefault(user_id, [])
+    now = datetime.now(timezone.utc)
+    moderator = str(interaction.user)
     entry = {
         "reason": reason,
-        "moderator": str(interaction.user),
-        "timestamp": datetime.utcnow().isoformat()
+        "moderator": moderator,
+        "timestamp": now.isoformat()
     }
-    data[guild_id][user_id].append(entry)
-    save_warnings(data)
-    count = len(data[guild_id][user_id])
+    count = str(add_warning(interaction.guild.id, member.id, entry))
     try:
         await member.send(embed=mod_embed(
             f"⚠️ You have been warned in {interaction.guild.name}",
-            discord.Colour.yellow(),
+            discord.Colour.yellow(), now,
             reason=reason,
-            moderator=str(interaction.user),
-            total_warnings=str(count)
+            moderator=moderator,
+            total_warnings=count
         ))
     except discord.Forbidden:
         pass
     embed = mod_embed(
-        "⚠️ Member Warned", discord.Colour.yellow(),
+        "⚠️ Member Warned", discord.Colour.yellow(), now,
         member=f"{member} ({member.id})",
         reason=reason,
-        total_warnings=str(count),
+        total_warnings=count,
         moderator=interaction.user.mention
     )
     await interaction.response.send_message(embed=embed)
-    await log(interaction.guild, embed)
+    log(interaction.guild, embed)
 
 
 @bot.tree.command(name="warnings", description="[Mod] View all warnings for a member.")
 @app_commands.describe(member="The member to check")
 @is_mod()
 async def warnings(interaction: discord.Interaction, member: discord.Member):
-    data = load_warnings()
-    guild_id = str(interaction.guild.id)
-    user_id  = str(member.id)
-    warns = data.get(guild_id, {}).get(user_id, [])
+    warns = get_warnings(interaction.guild.id, member.id)
     if not warns:
         return await interaction.response.send_message(
             f"✅ {member.mention} has no warnings.", ephemeral=True
@@ -507,7 +825,7 @@ async def warnings(interaction: discord.Interaction, member: discord.Member):
     embed = discord.Embed(
         title=f"⚠️ Warnings for {member}",
         colour=discord.Colour.yellow(),
-        timestamp=datetime.utcnow()
+        timestamp=datetime.now(timezone.utc)
     )
     for i, w in enumerate(warns, 1):
         embed.add_field(
@@ -542,7 +860,7 @@ async def purge(
         moderator=interaction.user.mention
     )
     await interaction.followup.send(embed=embed, ephemeral=True)
-    await log(interaction.guild, embed)
+    log(interaction.guild, embed)
 
 
 @bot.tree.command(name="slowmode", description="[Mod] Set slowmode for a channel.")
@@ -565,7 +883,18 @@ async def slowmode(
         moderator=interaction.user.mention
     )
     await interaction.response.send_message(embed=embed)
-    await log(interaction.guild, embed)
+    log(interaction.guild, embed)
+
+
+# Static in-channel notices; send() serialises them fresh each time.
+_LOCKED_NOTICE = discord.Embed(
+    description="🔒 This channel has been locked by a moderator.",
+    colour=discord.Colour.red()
+)
+_UNLOCKED_NOTICE = discord.Embed(
+    description="🔓 This channel has been unlocked.",
+    colour=discord.Colour.green()
+)
 
 
 @bot.tree.command(name="lock", description="[Mod] Lock a channel so members can't send messages.")
@@ -590,11 +919,8 @@ async def lock(
         moderator=interaction.user.mention
     )
     await interaction.response.send_message(embed=embed)
-    await target.send(embed=discord.Embed(
-        description="🔒 This channel has been locked by a moderator.",
-        colour=discord.Colour.red()
-    ))
-    await log(interaction.guild, embed)
+    await target.send(embed=_LOCKED_NOTICE)
+    log(interaction.guild, embed)
 
 
 @bot.tree.command(name="unlock", description="[Mod] Unlock a previously locked channel.")
@@ -619,11 +945,8 @@ async def unlock(
         moderator=interaction.user.mention
     )
     await interaction.response.send_message(embed=embed)
-    await target.send(embed=discord.Embed(
-        description="🔓 This channel has been unlocked.",
-        colour=discord.Colour.green()
-    ))
-    await log(interaction.guild, embed)
+    await target.send(embed=_UNLOCKED_NOTICE)
+    log(interaction.guild, embed)
 
 
 # ═══════════════════════════════════════════════════════════
@@ -639,18 +962,17 @@ async def userinfo(interaction: discord.Interaction, member: discord.Member = No
     embed = discord.Embed(
         title=f"👤 {member}",
         colour=member.colour if member.colour.value else discord.Colour.blurple(),
-        timestamp=datetime.utcnow()
+        timestamp=datetime.now(timezone.utc)
     )
     embed.set_thumbnail(url=member.display_avatar.url)
-    embed.add_field(name="ID",              value=member.id,                                                                    inline=True)
-    embed.add_field(name="Nickname",        value=member.nick or "None",                                                        inline=True)
-    embed.add_field(name="Bot",             value="Yes" if member.bot else "No",                                                 inline=True)
-    embed.add_field(name="Account Created", value=discord.utils.format_dt(member.created_at, "R"),                              inline=True)
-    embed.add_field(name="Joined Server",   value=discord.utils.format_dt(member.joined_at, "R") if member.joined_at else "Unknown", inline=True)
-    embed.add_field(name="Top Role",        value=member.top_role.mention,                                                       inline=True)
-    embed.add_field(name=f"Roles ({len(roles)})", value=" ".join(roles) if roles else "None",                                   inline=False)
-    data = load_warnings()
-    warn_count = len(data.get(str(interaction.guild.id), {}).get(str(member.id), []))
+    embed.add_field(name="ID",                    value=member.id,                            inline=True)
+    embed.add_field(name="Nickname",              value=member.nick or "None",                inline=True)
+    embed.add_field(name="Bot",                   value="Yes" if member.bot else "No",        inline=True)
+    embed.add_field(name="Account Created",       value=_reltime(member.created_at),          inline=True)
+    embed.add_field(name="Joined Server",         value=_reltime(member.joined_at),           inline=True)
+    embed.add_field(name="Top Role",              value=member.top_role.mention,              inline=True)
+    embed.add_field(name=f"Roles ({len(roles)})", value=" ".join(roles) if roles else "None", inline=False)
+    warn_count = len(get_warnings(interaction.guild.id, member.id))
     embed.add_field(name="Warnings", value=str(warn_count), inline=True)
     embed.set_footer(text="Moderation Bot")
     await interaction.response.send_message(embed=embed)
@@ -662,7 +984,7 @@ async def serverinfo(interaction: discord.Interaction):
     embed = discord.Embed(
         title=f"🏰 {g.name}",
         colour=discord.Colour.blurple(),
-        timestamp=datetime.utcnow()
+        timestamp=datetime.now(timezone.utc)
     )
     if g.icon:
         embed.set_thumbnail(url=g.icon.url)
@@ -672,62 +994,55 @@ async def serverinfo(interaction: discord.Interaction):
     embed.add_field(name="Channels",     value=str(len(g.channels)),                      inline=True)
     embed.add_field(name="Boosts",       value=str(g.premium_subscription_count),         inline=True)
     embed.add_field(name="Boost Level",  value=str(g.premium_tier),                       inline=True)
-    embed.add_field(name="Created",      value=discord.utils.format_dt(g.created_at, "R"), inline=True)
+    embed.add_field(name="Created",      value=_reltime(g.created_at),                    inline=True)
     embed.add_field(name="Verification", value=str(g.verification_level).title(),         inline=True)
     embed.set_footer(text=f"ID: {g.id}")
     await interaction.response.send_message(embed=embed)
 
 
+_ADMIN_HELP = (
+    ("`/setmodrole`",    "Set the Moderator role for this server"),
+    ("`/setadminrole`",  "Set the Admin role for this server"),
+    ("`/ban`",           "Ban a member from the server"),
+    ("`/unban`",         "Unban a user by ID"),
+    ("`/clearwarnings`", "Clear all warnings for a member"),
+    ("`/announce`",      "Send a formatted announcement"),
+    ("`/role`",          "Add or remove a role from a member"),
+)
+_MOD_HELP = (
+    ("`/kick`",      "Kick a member from the server"),
+    ("`/timeout`",   "Timeout (mute) a member"),
+    ("`/untimeout`", "Remove a timeout from a member"),
+    ("`/warn`",      "Issue a warning to a member"),
+    ("`/warnings`",  "View a member's warnings"),
+    ("`/purge`",     "Bulk-delete messages"),
+    ("`/slowmode`",  "Set channel slowmode"),
+    ("`/lock`",      "Lock a channel"),
+    ("`/unlock`",    "Unlock a channel"),
+)
+_GEN_HELP = (
+    ("`/userinfo`",   "View info about a member"),
+    ("`/serverinfo`", "View info about the server"),
+    ("`/help`",       "Show this help message"),
+)
+
+# The help text never changes, so join it once at import.
+_ADMIN_HELP_STR = "\n".join(f"{cmd} — {desc}" for cmd, desc in _ADMIN_HELP)
+_MOD_HELP_STR   = "\n".join(f"{cmd} — {desc}" for cmd, desc in _MOD_HELP)
+_GEN_HELP_STR   = "\n".join(f"{cmd} — {desc}" for cmd, desc in _GEN_HELP)
+
+
 @bot.tree.command(name="help", description="List all available commands.")
 async def help_cmd(interaction: discord.Interaction):
     embed = discord.Embed(
         title="📋 Bot Commands",
         colour=discord.Colour.from_rgb(232, 49, 42),
-        timestamp=datetime.utcnow()
+        timestamp=datetime.now(timezone.utc)
     )
     embed.set_footer(text="Moderation Bot")
-
-    admin_commands = [
-        ("`/setmodrole`",    "Set the Moderator role for this server"),
-        ("`/setadminrole`",  "Set the Admin role for this server"),
-        ("`/ban`",           "Ban a member from the server"),
-        ("`/unban`",         "Unban a user by ID"),
-        ("`/clearwarnings`", "Clear all warnings for a member"),
-        ("`/announce`",      "Send a formatted announcement"),
-        ("`/role`",          "Add or remove a role from a member"),
-    ]
-    mod_commands = [
-        ("`/kick`",      "Kick a member from the server"),
-        ("`/timeout`",   "Timeout (mute) a member"),
-        ("`/untimeout`", "Remove a timeout from a member"),
-        ("`/warn`",      "Issue a warning to a member"),
-        ("`/warnings`",  "View a member's warnings"),
-        ("`/purge`",     "Bulk-delete messages"),
-        ("`/slowmode`",  "Set channel slowmode"),
-        ("`/lock`",      "Lock a channel"),
-        ("`/unlock`",    "Unlock a channel"),
-    ]
-    general_commands = [
-        ("`/userinfo`",   "View info about a member"),
-        ("`/serverinfo`", "View info about the server"),
-        ("`/help`",       "Show this help message"),
-    ]
-
-    embed.add_field(
-        name="🔴 Admin Commands",
-        value="\n".join(f"{cmd} — {desc}" for cmd, desc in admin_commands),
-        inline=False
-    )
-    embed.add_field(
-        name="🟡 Moderator Commands",
-        value="\n".join(f"{cmd} — {desc}" for cmd, desc in mod_commands),
-        inline=False
-    )
-    embed.add_field(
-        name="🟢 General Commands",
-        value="\n".join(f"{cmd} — {desc}" for cmd, desc in general_commands),
-        inline=False
-    )
+    embed.add_field(name="🔴 Admin Commands",     value=_ADMIN_HELP_STR, inline=False)
+    embed.add_field(name="🟡 Moderator Commands", value=_MOD_HELP_STR,   inline=False)
+    embed.add_field(name="🟢 General Commands",   value=_GEN_HELP_STR,   inline=False)
     embed.add_field(
         name="🔐 Setup",
         value="Use `/setadminrole` and `/setmodrole` (requires Discord Admin permission) to configure role-based access.",